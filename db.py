@@ -1,22 +1,62 @@
 from datetime import datetime
-from sqlalchemy import create_engine, Column, Integer, JSON, DateTime
+from sqlalchemy import create_engine, event, Column, Integer, DateTime, LargeBinary, String
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 
 # Database setup
 DATABASE_URL = "sqlite:///./tictactoe.db"
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(bind=engine)
+# query_cache_size keeps compiled SQL cached across requests;
+# expire_on_commit=False avoids a re-SELECT when attributes are read
+# after commit (we never reuse a session across requests anyway).
+# The default QueuePool keeps long-lived per-thread connections, which
+# is what WAL needs for concurrent readers/writers - each session must
+# get its own connection so transactions stay isolated.
+# check_same_thread=False lets the threadpool-dispatched handlers use
+# pooled connections from any thread.
+engine = create_engine(
+    DATABASE_URL,
+    query_cache_size=1200,
+    connect_args={"check_same_thread": False},
+)
+SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
 Base = declarative_base()
 
 
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets reads proceed concurrently with writes, and
+    # synchronous=NORMAL halves the fsyncs per commit (still durable
+    # enough for a game server)
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
 # Database models
 class DbGame(Base):
     __tablename__ = "games"
     id = Column(Integer, primary_key=True, index=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    moves = Column(JSON, nullable=True)  # store list of moves as JSON - not beautiful, but simple and data is small
+    # one byte per move (cell index y*3+x) - a whole game is at most 9
+    # bytes and there's no JSON encode/decode per request
+    moves = Column(LargeBinary, nullable=True)
+    # current position as (x_bits, o_bits) bitboards plus the winner, so
+    # /move can pick up where the game left off without replaying `moves`
+    x_bits = Column(Integer, default=0, nullable=False)
+    o_bits = Column(Integer, default=0, nullable=False)
+    winner = Column(String, nullable=True)
+
+
+def pack_moves(moves):
+    """Pack a list of (x, y) moves into one byte per move."""
+    return bytes(y * 3 + x for x, y in moves)
+
+
+def unpack_moves(blob):
+    """Unpack a moves blob back into the list of (x, y) moves."""
+    return [(v % 3, v // 3) for v in blob or b""]
 
 
 # Create tables
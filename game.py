@@ -1,43 +1,122 @@
-import copy
+import functools
 import random
 from typing import List, Tuple
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional - without it the pure-Python path runs
+    njit = None
+
 
 GAME_MODE = "perfect"  # The computer will use the optimal minimax algorithm to select moves.
 # GAME_MODE = "random"  # The computer will select random moves.
 
 
+# A board is a pair of 9-bit ints (x_bits, o_bits) where bit y*3+x is set
+# if that player has a mark at (x, y). Integer masks make the win/draw
+# checks and the minimax recursion a handful of int ops instead of
+# nested-list traversals. The eight winning-line masks live unrolled in
+# _has_won, which is called at every search node.
+FULL_BOARD = 0b111111111
+
+
 class IllegalMoveError(Exception):
     pass
 
 
+def _bit(x: int, y: int) -> int:
+    return 1 << (y * 3 + x)
+
+
+def board_history(moves: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    Rebuild the per-move sequence of (x_bits, o_bits) boards from a move
+    list, starting with the empty board. Only /view_game needs history,
+    so it's reconstructed on demand rather than kept on every Game.
+    """
+    boards = [(0, 0)]
+    for i, loc in enumerate(moves or []):
+        x, y = loc
+        x_bits, o_bits = boards[-1]
+        if i % 2 == 0:
+            x_bits |= _bit(x, y)
+        else:
+            o_bits |= _bit(x, y)
+        boards.append((x_bits, o_bits))
+    return boards
+
+
+def board_to_lists(board: Tuple[int, int]) -> List[List[str]]:
+    """
+    Materialize a (x_bits, o_bits) bitboard pair as the 3x3 list-of-lists
+    of "X"/"O"/"." marks used at the API and rendering boundaries.
+    """
+    x_bits, o_bits = board
+    return [
+        [
+            "X" if x_bits & _bit(x, y) else "O" if o_bits & _bit(x, y) else "."
+            for x in range(3)
+        ]
+        for y in range(3)
+    ]
+
+
 class Game:
     def __init__(self, _id: int, moves: List[Tuple[int, int]]):
         self.id = _id
         self.moves = moves or []
 
-        # (re)build the sequence of game boards
-        self.boards = [[
-            [".", ".", "."],
-            [".", ".", "."],
-            [".", ".", "."]
-        ]]
+        # (re)build the current board as a (x_bits, o_bits) pair; only the
+        # latest position matters for play - use board_history for the
+        # full per-move sequence
+        self.board = (0, 0)
         for i, loc in enumerate(self.moves):
             x, y = loc
-            self.boards.append(copy.deepcopy(self.boards[-1]))
-            self.boards[-1][y][x] = ("X", "O")[i % 2]
+            x_bits, o_bits = self.board
+            if i % 2 == 0:
+                x_bits |= _bit(x, y)
+            else:
+                o_bits |= _bit(x, y)
+            self.board = (x_bits, o_bits)
 
         # determine remaining open positions
+        x_bits, o_bits = self.board
+        occupied = x_bits | o_bits
         self.open_spaces = set()
         for x in range(3):
             for y in range(3):
-                if self.boards[-1][y][x] == ".":
+                if not occupied & _bit(x, y):
                     self.open_spaces.add((x, y))
 
         # determine winner (if any)
         self.winner = None
         self._determine_winner()
 
+    @classmethod
+    def from_bits(cls, _id: int, x_bits: int, o_bits: int, winner: str = None) -> "Game":
+        """
+        Build a Game directly from a stored (x_bits, o_bits) position,
+        skipping the per-move replay in __init__. `moves` starts empty and
+        only records moves made from here on.
+        """
+        game = cls.__new__(cls)
+        game.id = _id
+        game.moves = []
+        game.board = (x_bits, o_bits)
+
+        # determine remaining open positions
+        occupied = x_bits | o_bits
+        game.open_spaces = set()
+        for x in range(3):
+            for y in range(3):
+                if not occupied & _bit(x, y):
+                    game.open_spaces.add((x, y))
+
+        game.winner = winner
+        if winner is None:
+            game._determine_winner()
+        return game
+
     def play_round(self, x: int, y: int) -> None:
         self._move(x, y)
         self._determine_winner()
@@ -46,101 +125,173 @@ class Game:
             self._determine_winner()
 
     def _determine_winner(self) -> None:
-        if _has_won(self.boards[-1], "X"):
+        x_bits, o_bits = self.board
+        if _has_won(x_bits):
             self.winner = "X"
-        elif _has_won(self.boards[-1], "O"):
+        elif _has_won(o_bits):
             self.winner = "O"
-        elif _is_draw(self.boards[-1]):
+        elif _is_draw(x_bits, o_bits):
             self.winner = "draw"
 
     def _move(self, x: int, y: int, mark: str = "X") -> None:
         if not (x, y) in self.open_spaces:
             raise IllegalMoveError()
-        self.boards.append(copy.deepcopy(self.boards[-1]))
-        self.boards[-1][y][x] = mark
+        x_bits, o_bits = self.board
+        if mark == "X":
+            x_bits |= _bit(x, y)
+        else:
+            o_bits |= _bit(x, y)
+        self.board = (x_bits, o_bits)
         self.moves.append((x, y))
         self.open_spaces.remove((x, y))
 
     def _computer_move(self) -> None:
         if GAME_MODE == "perfect":
-            location = _minimax(self.boards[-1], "O", "X")
+            location = _POLICY[self.board]  # the computer plays "O"
         else:
             location = random.choice(list(self.open_spaces))
         self._move(*location, mark="O")
 
 
-def _has_won(board, mark):
+def _has_won(bits):
     # The board is small and constant size so this is a fast-enough
     # check that works by only looking at the board. It doesn't
     # bother restricting checks to only where the last move was made.
-
-    # if ... any complete row has mark m
-    return any(  # if any complete row has mark
-        all(board[y][x] == mark for x in range(3)) for y in range(3)
-    ) or any(  # or any complete column has mark
-        all(board[y][x] == mark for y in range(3)) for x in range(3)  # Columns
-    ) or all(  # or the x=y diagonal is all mark
-        board[i][i] == mark for i in range(3)
-    ) or all(  # or the x+y=2 diagonal is all mark
-        board[i][2 - i] == mark for i in range(3)
+    # Unrolled over the eight winning-line masks so each call is one
+    # chained boolean expression with no loop or generator overhead.
+    return (
+        bits & 0b000000111 == 0b000000111  # rows
+        or bits & 0b000111000 == 0b000111000
+        or bits & 0b111000000 == 0b111000000
+        or bits & 0b001001001 == 0b001001001  # columns
+        or bits & 0b010010010 == 0b010010010
+        or bits & 0b100100100 == 0b100100100
+        or bits & 0b100010001 == 0b100010001  # x==y diagonal
+        or bits & 0b001010100 == 0b001010100  # x+y==2 diagonal
     )
 
 
-def _is_draw(board):
+def _is_draw(x_bits, o_bits):
     # if the board is full of non-blanks then it's a draw
-    return all(board[y][x] != "." for y in range(3) for x in range(3))
+    return (x_bits | o_bits) == FULL_BOARD
 
 
-def _minimax(board, player, opponent):
+def _minimax(player_bits, opponent_bits):
     """
     Implements the minimax algorithm which will find the optimal next move
     in this solved game of tic tac toe. It will always win or draw against
     another player.
-    :param board: The current game board.
-    :param player: The mark of the player who should play optimally.
-    :param opponent: The mark of the "other" player who we're trying to beat.
-    :return: The optimal next move for "player" to make.
+    :param player_bits: The bitboard of the player who should play optimally.
+    :param opponent_bits: The bitboard of the "other" player who we're trying to beat.
+    :return: The optimal next move for the player to make.
     """
     best_move = None
-    best_score = -float("inf")
-    for y in range(3):
-        for x in range(3):
-            if board[y][x] == ".":
-                board[y][x] = player
-                score = _minimax_recurse(board, False, player, opponent)
-                board[y][x] = "."  # algo operates in-place so restore the blank
-                if score > best_score:
-                    best_score = score
-                    best_move = (x, y)
+    best_score = -2  # scores only span -1..1, so +/-2 bound them
+    occupied = player_bits | opponent_bits
+    for i in range(9):
+        bit = 1 << i
+        if not occupied & bit:
+            # ints are immutable so there's no restore step after recursing
+            score = _minimax_recurse(
+                player_bits | bit, opponent_bits, False, best_score, 2)
+            if score > best_score:
+                best_score = score
+                best_move = (i % 3, i // 3)
     return best_move
 
 
-def _minimax_recurse(board, is_maximizing, player, opponent):
-    if _has_won(board, player):
+def _minimax_recurse(player_bits, opponent_bits, is_maximizing,
+                     alpha=-2, beta=2):
+    # Only the side that just moved can have completed a line, so check
+    # just that bitboard: when it's the maximizer's turn the opponent
+    # moved last, and vice versa.
+    if is_maximizing:
+        if _has_won(opponent_bits):
+            return -1
+    elif _has_won(player_bits):
         return 1
-    if _has_won(board, opponent):
-        return -1
-    if _is_draw(board):
+    if (player_bits | opponent_bits) == FULL_BOARD:  # draw (inlined for Numba)
         return 0
 
     # it's tempting to DRY up these loops, but it just becomes harder to read
+    occupied = player_bits | opponent_bits
     if is_maximizing:
-        best_score = -float("inf")
-        for y in range(3):
-            for x in range(3):
-                if board[y][x] == ".":
-                    board[y][x] = player
-                    score = _minimax_recurse(board, False, player, opponent)
-                    board[y][x] = "."  # algo operates in-place so restore the blank
-                    best_score = max(best_score, score)
+        best_score = -2
+        for i in range(9):
+            bit = 1 << i
+            if not occupied & bit:
+                score = _minimax_recurse(
+                    player_bits | bit, opponent_bits, False, alpha, beta)
+                best_score = max(best_score, score)
+                alpha = max(alpha, best_score)
+                if beta <= alpha:  # opponent won't allow this line anyway
+                    return best_score
         return best_score
     else:
-        best_score = float("inf")
-        for y in range(3):
-            for x in range(3):
-                if board[y][x] == ".":
-                    board[y][x] = opponent
-                    score = _minimax_recurse(board, True, player, opponent)
-                    board[y][x] = "."  # algo operates in-place so restore the blank
-                    best_score = min(best_score, score)
+        best_score = 2
+        for i in range(9):
+            bit = 1 << i
+            if not occupied & bit:
+                score = _minimax_recurse(
+                    player_bits, opponent_bits | bit, True, alpha, beta)
+                best_score = min(best_score, score)
+                beta = min(beta, best_score)
+                if beta <= alpha:  # we won't allow this line anyway
+                    return best_score
         return best_score
+
+
+if njit is not None:
+    # Everything in the search is integer bit twiddling, which is exactly
+    # what Numba compiles well. The policy build below doubles as the JIT
+    # warm-up call. Note: no cache=True on the self-recursive dispatcher -
+    # reloading it from Numba's on-disk cache segfaults on the next
+    # interpreter start (seen on numba 0.67 / Python 3.11), so it pays a
+    # one-time recompile at import instead.
+    _has_won = njit(cache=True)(_has_won)
+    _minimax_recurse = njit(_minimax_recurse)
+else:
+    # Memoization works as a transposition table: different move orders
+    # reach the same (player_bits, opponent_bits) position, and the game
+    # is small enough (~5500 positions) to cache every evaluation forever.
+    _minimax_recurse = functools.lru_cache(maxsize=None)(_minimax_recurse)
+
+
+# Tic tac toe is small enough to solve outright: the perfect computer
+# consults this static {(x_bits, o_bits): (x, y)} table instead of
+# running minimax per request.
+_POLICY: dict = {}
+
+
+def _build_policy():
+    """
+    Enumerate every reachable position from the empty board (both players
+    branching over all legal moves, so the table covers games where "O"
+    previously played imperfectly) and record the minimax move for each
+    live position where "O" is to move.
+    """
+    seen = set()
+    stack = [(0, 0)]
+    while stack:
+        board = stack.pop()
+        if board in seen:
+            continue
+        seen.add(board)
+        x_bits, o_bits = board
+        if _has_won(x_bits) or _has_won(o_bits) or _is_draw(x_bits, o_bits):
+            continue
+        o_to_move = x_bits.bit_count() > o_bits.bit_count()
+        if o_to_move:
+            _POLICY[board] = _minimax(o_bits, x_bits)
+        occupied = x_bits | o_bits
+        for i in range(9):
+            bit = 1 << i
+            if not occupied & bit:
+                if o_to_move:
+                    stack.append((x_bits, o_bits | bit))
+                else:
+                    stack.append((x_bits | bit, o_bits))
+
+
+# Build the policy once at import time so /move requests do no search at all.
+_build_policy()
@@ -5,8 +5,8 @@ from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
 
 # FastAPI app instance
-from db import get_db, DbGame
-from game import Game, IllegalMoveError
+from db import get_db, DbGame, pack_moves, unpack_moves
+from game import Game, IllegalMoveError, board_history, board_to_lists
 
 app = FastAPI()
 
@@ -34,7 +34,7 @@ class GameView(BaseModel):
 # TODO: Flesh out decorators for Swagger docs
 
 @app.post("/game", response_model=GameId)
-async def new_game(db: Session = Depends(get_db)):
+def new_game(db: Session = Depends(get_db)):
     """
     Create a new game of Noughts and Crosses, and returns the game ID.
     :return: ID of the new game
@@ -42,13 +42,16 @@ async def new_game(db: Session = Depends(get_db)):
     # Allows me to create a new game of Noughts and Crosses, and returns the game ID.
     db_game = DbGame()
     db.add(db_game)
+    # flush runs the INSERT and populates the autogenerated id in one
+    # round-trip; no post-commit refresh SELECT needed
+    db.flush()
+    gid = db_game.id
     db.commit()
-    db.refresh(db_game)
-    return GameId(gid=db_game.id)
+    return GameId(gid=gid)
 
 
 @app.post("/game/{_id}/move", response_model=BoardView)
-async def move(_id: str, location: Location, db: Session = Depends(get_db)):
+def move(_id: str, location: Location, db: Session = Depends(get_db)):
     """
     Make the next move by specifying the co-ordinates to place an X.
     e.g. {"x": 1, "y": 1} would denote a move to the middle square by the requesting player,
@@ -60,23 +63,29 @@ async def move(_id: str, location: Location, db: Session = Depends(get_db)):
     :return: The new state of the "board" after the computer has also moved or game has been won
     and the "winner" - one of null (no winner yet), "X", "O" or "draw".
     """
-    db_game = db.query(DbGame).filter(DbGame.id == int(_id)).first()
+    db_game = db.get(DbGame, int(_id))
     if db_game is None:
         raise HTTPException(status_code=404, detail="Game not found")
-    moves = [tuple(m) for m in db_game.moves] if db_game.moves is not None else None
-    game = Game(db_game.id, moves)
+    # build from the stored position; no need to replay the move history
+    game = Game.from_bits(db_game.id, db_game.x_bits, db_game.o_bits, db_game.winner)
     try:
         game.play_round(location.x, location.y)
-        db_game.moves = game.moves
+        db_game.x_bits, db_game.o_bits = game.board
+        db_game.winner = game.winner
+        # `moves` keeps the full history for /view_game; game.moves only
+        # holds the moves made this round, so append them
+        db_game.moves = (db_game.moves or b"") + pack_moves(game.moves)
+        # the response only depends on the in-memory game, so build it
+        # before committing
+        board_view = BoardView(board=board_to_lists(game.board), winner=game.winner)
         db.commit()
-        db.flush()
-        return BoardView(board=game.boards[-1], winner=game.winner)
+        return board_view
     except IllegalMoveError as e:
         raise HTTPException(status_code=422, detail="Illegal move")
 
 
 @app.get("/game/{_id}", response_model=GameView)
-async def view_game(_id: str, db: Session = Depends(get_db)):
+def view_game(_id: str, db: Session = Depends(get_db)):
     """
     Returns all moves in a game, chronologically ordered
     and the winner, if any.
@@ -86,16 +95,17 @@ async def view_game(_id: str, db: Session = Depends(get_db)):
     game "boards" and the "winner" - one of null (no winner yet),
     "X", "O" or "draw".
     """
-    db_game = db.query(DbGame).filter(DbGame.id == int(_id)).first()
+    db_game = db.get(DbGame, int(_id))
     if db_game is None:
         raise HTTPException(status_code=404, detail="Game not found")
-    moves = [tuple(m) for m in db_game.moves] if db_game.moves is not None else None
-    game = Game(db_game.id, moves)
-    return GameView(boards=game.boards, winner=game.winner)
+    # The history is rebuilt on demand here; this endpoint isn't
+    # latency-critical.
+    boards = board_history(unpack_moves(db_game.moves))
+    return GameView(boards=[board_to_lists(b) for b in boards], winner=db_game.winner)
 
 
 @app.get("/game", response_model=List[int])
-async def list_games(db: Session = Depends(get_db)):
+def list_games(db: Session = Depends(get_db)):
     """
     Returns a list of all games created, chronologically ordered.
     :param db: The db session
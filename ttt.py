@@ -2,9 +2,9 @@ import sys
 
 import pygame
 
-from pygame.sprite import Group
+from pygame.sprite import LayeredDirty
 from pygame.surface import Surface
-from game import Game, IllegalMoveError
+from game import Game, IllegalMoveError, board_to_lists
 
 # Constants
 FPS = 60
@@ -20,25 +20,33 @@ GRIDLINE_COLOR = "white"
 MARK_COLOR = "white"
 
 
-class MarkSprite(pygame.sprite.Sprite):
+class MarkSprite(pygame.sprite.DirtySprite):
+    # the X/O/blank Surfaces are identical for every sprite, so render
+    # them once on first construction and share them
+    _MARK_IMAGES = None
+
     def __init__(self, pos):
         super().__init__()
-        self.mark_images = {
-            ".": Surface((BLOCK_SIZE, BLOCK_SIZE), pygame.SRCALPHA),
-            "X": Surface((BLOCK_SIZE, BLOCK_SIZE), pygame.SRCALPHA),
-            "O": Surface((BLOCK_SIZE, BLOCK_SIZE), pygame.SRCALPHA)
-        }
-        self.draw_x(self.mark_images["X"])
-        self.draw_o(self.mark_images["O"])
+        if MarkSprite._MARK_IMAGES is None:
+            MarkSprite._MARK_IMAGES = {
+                ".": Surface((BLOCK_SIZE, BLOCK_SIZE), pygame.SRCALPHA),
+                "X": Surface((BLOCK_SIZE, BLOCK_SIZE), pygame.SRCALPHA),
+                "O": Surface((BLOCK_SIZE, BLOCK_SIZE), pygame.SRCALPHA)
+            }
+            self.draw_x(MarkSprite._MARK_IMAGES["X"])
+            self.draw_o(MarkSprite._MARK_IMAGES["O"])
+        self.mark_images = MarkSprite._MARK_IMAGES
         self._mark = "."
         self.image = self.mark_images["."]
         self.rect = self.image.get_rect(center=pos)
 
     def mark(self, m: str):
-        self._mark = m
-
-    def update(self) -> None:
-        self.image = self.mark_images[self._mark]
+        # only flag the sprite dirty when the mark actually changed so
+        # LayeredDirty can skip blitting the rest
+        if m != self._mark:
+            self._mark = m
+            self.image = self.mark_images[m]
+            self.dirty = 1
 
     def draw_x(self, screen: Surface):
         start_pos = (PAD_SIZE, PAD_SIZE)
@@ -56,7 +64,7 @@ class MarkSprite(pygame.sprite.Sprite):
 class GameRenderer:
     def __init__(self):
         self.game = Game(0, None)
-        self.sprites = Group(
+        self.sprites = LayeredDirty(
             [
                 MarkSprite((x * BLOCK_SIZE + BLOCK_SIZE//2, y * BLOCK_SIZE + BLOCK_SIZE//2))
                 for x in range(3) for y in range(3)
@@ -64,10 +72,15 @@ class GameRenderer:
         )
         self.font = pygame.font.Font(None, 36)
         self.game_over = False
+        self.dirty = True  # needs an initial draw
+        # the grid never changes, so render it once and blit it per frame
+        self._background = Surface((BOARD_SIZE, BOARD_SIZE))
+        self.draw_grid(self._background)
 
     def draw(self, screen: Surface):
-        self.draw_grid(screen)
-        self.sprites.draw(screen)
+        # LayeredDirty repairs the background under dirty sprites and
+        # returns just the rects that changed
+        rects = self.sprites.draw(screen, self._background)
 
         if self.game_over:
             if self.game.winner == "draw":
@@ -76,7 +89,8 @@ class GameRenderer:
                 text = self.font.render(f"{self.game.winner} wins!", True, 'yellow', 'black')
             text_rect = text.get_rect()
             text_rect.center = (BOARD_SIZE//2, BOARD_SIZE//2)
-            screen.blit(text, text_rect)
+            rects.append(screen.blit(text, text_rect))
+        return rects
 
     def draw_grid(self, screen):
         # horizontal gridlines
@@ -103,11 +117,13 @@ class GameRenderer:
         except IllegalMoveError:
             return  # just ignore the click
         # set all sprite states based on current board
+        board = board_to_lists(self.game.board)
         for y in range(3):
             for x in range(3):
-                self.sprites.sprites()[y*3+x].mark(self.game.boards[-1][y][x])
+                self.sprites.sprites()[y*3+x].mark(board[y][x])
         # check for game over (win or draw)
         self.game_over = (self.game.winner is not None)
+        self.dirty = True
 
     def update(self):
         self.sprites.update()
@@ -143,10 +159,14 @@ def main():
                 elif event.key == pygame.K_n:
                     game = GameRenderer()
 
-        game.update()
-
-        pygame.display.flip()
-        game.draw(screen)
+        # there's no animation, so only redraw when the board changed -
+        # and draw before flipping so the frame shows up this iteration,
+        # not the next one
+        if game.dirty:
+            game.update()
+            rects = game.draw(screen)
+            pygame.display.update(rects)
+            game.dirty = False
         clock.tick(FPS)
 
     pygame.quit()